@@ -8,6 +8,14 @@ OUTPUT_FOLDER = "results"
 # File patterns
 PDF_EXTENSION = ".pdf"
 
+# PDF text extraction: pypdfium2 (if installed) is much faster than PyPDF2, but its
+# text layout differs slightly - validate extraction results before enabling
+USE_PDFIUM = False
+
+# Extracted PDF text, keyed by path + mtime + size, so re-runs skip unchanged PDFs (None = off)
+PDF_TEXT_CACHE_DIR = ".pdf_text_cache"
+PDF_TEXT_CACHE_MAX_AGE_DAYS = 30  # entries not used for this long are deleted at batch start
+
 # Validation ranges
 FRACHT_MIN = 50
 FRACHT_MAX = 5000
@@ -15,12 +23,32 @@ FRACHT_MAX = 5000
 # Output files
 JSON_OUTPUT = "extraction_results.json"
 
+# Fields an order needs to count as complete (in data dict order)
+REQUIRED_FIELDS = (
+    'zlecenie_nr',
+    'termin_rozladunku',
+    'tablica_rejestracyjna',
+    'fracht',
+    'miejsce_zaladunku',
+    'miejsce_rozladunku',
+)
+
 # City extraction (optional spaCy support)
 USE_SPACY_CITIES = True
 SPACY_CITY_MODELS = ['pl_core_news_sm', 'de_core_news_sm']
+# Only NER is needed for cities; these components are not even loaded (tok2vec is
+# kept only if ner listens to it, which is checked per model at load time)
+SPACY_EXCLUDED_PIPES = ['tagger', 'morphologizer', 'parser', 'senter', 'lemmatizer', 'attribute_ruler']
+SPACY_BATCH_SIZE = 8  # sections per nlp.pipe() batch
 CITY_SECTION_MAX_LINES = 30
+USE_HYPERSCAN = True  # use hyperscan (if installed) to prescan ZIP lines
 
 # Google Sheets configuration
 GOOGLE_SHEET_ID = "1Xx-LfKeg2tG1cwm5wdMHW7AQGID3a0-7zs4ufQ7iwKU"
 CREDENTIALS_FILE = "utils/credentials.json"  # Path to service account credentials
-ENABLE_SHEETS_EXPORT = True  # Toggle for testing
\ No newline at end of file
+ENABLE_SHEETS_EXPORT = True  # Toggle for testing
+
+# Batch processing
+MAX_WORKERS = None  # PDF worker processes (None = os.cpu_count())
+PARALLEL_MIN_PDFS = 8  # smaller batches are processed in-process
+PROGRESS_FLUSH_S = 0.1  # CLI batch status lines are written at most this often
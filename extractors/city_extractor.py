@@ -1,19 +1,60 @@
 """City extraction using hybrid Regex + optional spaCy NER."""
 
 import re
-from typing import Optional, Tuple, List
+from bisect import bisect_right
+from contextlib import contextmanager
+from functools import wraps
+from itertools import accumulate
+from typing import Dict, Iterator, Optional, Tuple, List
 
 try:
     import spacy  # type: ignore
 except Exception:
     spacy = None  # lazy handled
 
+try:
+    import hyperscan  # type: ignore
+except Exception:
+    hyperscan = None  # optional SIMD prescan; the fused `re` pattern is used otherwise
+
 from config import (
     CITY_SECTION_MAX_LINES,
     USE_SPACY_CITIES,
     SPACY_CITY_MODELS,
+    SPACY_EXCLUDED_PIPES,
+    SPACY_BATCH_SIZE,
+    USE_HYPERSCAN,
 )
 
+# Whitespace that never ends a line (str.splitlines() boundaries excluded)
+_LINE_SPACE = r"[^\S\n\r\x0b\x0c\x1c-\x1e\x85\u2028\u2029]"
+
+# Max entries memoized by _clean_city() before the memo is reset
+_CLEAN_CACHE_SIZE = 4096
+
+
+def _extraction_scoped(method):
+    """Run method inside an extraction scope (nested calls share the outer one)."""
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._extraction_scope():
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
+def _scope_cached(method):
+    """Memoize method(self, text) for the duration of the current extraction scope."""
+    @wraps(method)
+    def wrapper(self, text):
+        cache = self._scope_cache
+        if cache is None:
+            return method(self, text)
+        key = (method.__name__, text)
+        if key not in cache:
+            cache[key] = method(self, text)
+        return cache[key]
+    return wrapper
+
 
 class CityExtractor:
     """Extract loading and unloading cities from raw PDF text.
@@ -27,6 +68,7 @@ class CityExtractor:
         self.use_spacy = use_spacy and USE_SPACY_CITIES
         self.lang_models = lang_models or SPACY_CITY_MODELS
         self._nlp_pipelines = None  # lazy-loaded dict[str, Any]
+        self._scope_cache = None  # per-extraction memo, see _extraction_scope()
 
         # Precompile regex patterns
         self._pattern_pl_zip_city = re.compile(
@@ -44,26 +86,63 @@ class CityExtractor:
         self._pattern_de_bare_zip_city = re.compile(
             r"\b\d{5}\s+([A-Za-zÄÖÜäöüẞß .\-']+)"
         )
+        # ZIP patterns in priority order; the fused alternation finds every ZIP line in one pass
+        self._zip_patterns = (
+            self._pattern_pl_zip_city,
+            self._pattern_de_zip_city,
+            self._pattern_pl_bare_zip_city,
+            self._pattern_de_bare_zip_city,
+        )
+        fused = []
+        for pattern in self._zip_patterns:
+            flags = "?i:" if pattern.flags & re.IGNORECASE else "?:"
+            fused.append("(" + flags + pattern.pattern.replace(r"\s", _LINE_SPACE) + ")")
+        self._pattern_zip_any = re.compile("|".join(fused))
+        self._hs_zip_db = self._build_hyperscan_db() if USE_HYPERSCAN else None
         self._pattern_city_only = re.compile(
             r"\b([A-ZĄĆĘŁŃÓŚŻŹÄÖÜ][A-Za-zĄĆĘŁŃÓŚŻŹÄÖÜäöüẞß .\-']{2,}(?:\s+b\.\s+[A-Za-z .\-']+)?)\b"
         )
+        # Section headers (single-line and split "Miejsce" / "zaladunku" variants)
+        self._load_header_re = self._alternation(["Miejsce załadunku", "Miejsce zaladunku"])
+        self._unload_header_re = self._alternation(["Miejsce rozładunku", "Miejsce rozladunku"])
+        self._load_tail_re = self._alternation(["załadunku", "zaladunku"])
+        self._unload_tail_re = self._alternation(["rozładunku", "rozladunku"])
+        self._miejsce_re = re.compile(r"\bMiejsce\b", re.IGNORECASE)
+        # Any of these ends the current section
+        self._stop_header_re = self._alternation([
+            "Miejsce załadunku",
+            "Miejsce zaladunku",
+            "Miejsce rozładunku",
+            "Miejsce rozladunku",
+            "Zlecenie",
+            "Samochód",
+            "Samochod",
+            "Vereinbarter Frachtpreis",
+            "Termin rozladunku",
+        ])
+        # _clean_city() patterns; the cut is the earliest annotation or separator.
+        # "attn" directly followed by "a zlec" shares its "n" with "na zlec", which cuts later.
+        self._clean_zip_re = re.compile(r"\b(?:PL|D|D-)\s?\d{2}-?\d{3,5}\s*", re.IGNORECASE)
+        self._clean_bare_zip_re = re.compile(r"\b\d{2}-?\d{3,5}\b")
+        self._clean_cut_re = re.compile(r"na zlec|auftr|attn(?!a zlec)|[;,|]")
+        self._clean_cache: Dict[str, str] = {}
         # Common street indicators (PL/DE)
         self._street_tokens = {
             'str.', 'straße', 'strasse', 'allee', 'ul.', 'ulica', 'platz', 'ring', 'weg', 'gasse', 'am', 'an der'
         }
+        # All street tokens in one pass over the lowered line (same result as `tok in low` for each)
+        self._street_re = re.compile(r"|".join(re.escape(t) for t in sorted(self._street_tokens)))
 
+    @_extraction_scoped
     def extract_from_text(self, text: str) -> Tuple[Optional[str], Optional[str]]:
         """Return (miejsce_zaladunku, miejsce_rozladunku) from full PDF text."""
-        loading_block = self._extract_section(
-            text, ["Miejsce załadunku", "Miejsce zaladunku"], two_line_tail=["załadunku", "zaladunku"]
-        )
-        unloading_block = self._extract_section(
-            text, ["Miejsce rozładunku", "Miejsce rozladunku"], two_line_tail=["rozładunku", "rozladunku"]
-        )
+        loading_block = self._extract_section(text, self._load_header_re, self._load_tail_re)
+        unloading_block = self._extract_section(text, self._unload_header_re, self._unload_tail_re)
+
+        # Sections the regex can't resolve go through spaCy together in one nlp.pipe() batch
+        self._prime_docs([b for b in (loading_block, unloading_block) if b and not self._regex_city(b)])
 
-        loading_city = self._choose_best(
-            self._regex_city(loading_block), self._ner_city(loading_block)
-        ) if loading_block else None
+        loading_city = self._choose_best(loading_block) if loading_block else None
 
         # Unloading can contain multiple places; collect and join with '-'
         if unloading_block:
@@ -71,51 +150,32 @@ class CityExtractor:
             if unloading_list:
                 unloading_city = "-".join(unloading_list)
             else:
-                unloading_city = self._choose_best(
-                    self._regex_city(unloading_block), self._ner_city(unloading_block)
-                )
+                unloading_city = self._choose_best(unloading_block)
         else:
             unloading_city = None
 
         # Global fallback if section-based extraction failed
-        if loading_city is None or unloading_city is None:
-            candidates = self._find_global_city_candidates(text)
-            if loading_city is None and candidates:
-                loading_city = candidates[0]
-            if unloading_city is None and candidates:
-                unloading_city = candidates[-1]
-
-        return loading_city, unloading_city
+        return self._global_fallback(text, loading_city, unloading_city)
 
+    @_extraction_scoped
     def extract_regex_only(self, text: str) -> Tuple[Optional[str], Optional[str]]:
         """Regex-only extraction ignoring spaCy completely."""
-        loading_block = self._extract_section(
-            text, ["Miejsce załadunku", "Miejsce zaladunku"], two_line_tail=["załadunku", "zaladunku"]
-        )
-        unloading_block = self._extract_section(
-            text, ["Miejsce rozładunku", "Miejsce rozladunku"], two_line_tail=["rozładunku", "rozladunku"]
-        )
+        loading_block = self._extract_section(text, self._load_header_re, self._load_tail_re)
+        unloading_block = self._extract_section(text, self._unload_header_re, self._unload_tail_re)
 
         loading_city = self._regex_city(loading_block) if loading_block else None
         unloading_city = self._regex_city(unloading_block) if unloading_block else None
 
-        if loading_city is None or unloading_city is None:
-            candidates = self._find_global_city_candidates(text)
-            if loading_city is None and candidates:
-                loading_city = candidates[0]
-            if unloading_city is None and candidates:
-                unloading_city = candidates[-1]
-
-        return loading_city, unloading_city
+        return self._global_fallback(text, loading_city, unloading_city)
 
+    @_extraction_scoped
     def extract_ner_only(self, text: str) -> Tuple[Optional[str], Optional[str]]:
         """spaCy-only extraction ignoring regex preferences."""
-        loading_block = self._extract_section(
-            text, ["Miejsce załadunku", "Miejsce zaladunku"], two_line_tail=["załadunku", "zaladunku"]
-        )
-        unloading_block = self._extract_section(
-            text, ["Miejsce rozładunku", "Miejsce rozladunku"], two_line_tail=["rozładunku", "rozladunku"]
-        )
+        loading_block = self._extract_section(text, self._load_header_re, self._load_tail_re)
+        unloading_block = self._extract_section(text, self._unload_header_re, self._unload_tail_re)
+
+        # _ner_city() trusts a regex ZIP+city without looking at docs, so only parse the rest
+        self._prime_docs([b for b in (loading_block, unloading_block) if b and not self._regex_city(b)])
 
         loading_city = self._ner_city(loading_block) if loading_block else None
         unloading_city = self._ner_city(unloading_block) if unloading_block else None
@@ -129,8 +189,10 @@ class CityExtractor:
 
         return loading_city, unloading_city
 
+    @_extraction_scoped
     def compare_methods(self, text: str):
         """Return a dict with regex-only, spacy-only, and current hybrid outputs."""
+        # Shared scope: section scans and spaCy docs are computed once for all three
         regex_load, regex_unload = self.extract_regex_only(text)
         ner_load, ner_unload = self.extract_ner_only(text)
         hybrid_load, hybrid_unload = self.extract_from_text(text)
@@ -149,6 +211,14 @@ class CityExtractor:
             },
         }
 
+    def warmup(self) -> None:
+        """Load the spaCy models and run each once, so the first order doesn't pay for it."""
+        for nlp in self._ensure_models():
+            try:
+                nlp("Zaladunek: 00-001 Warszawa")
+            except Exception:
+                continue
+
     def ner_diagnostics(self):
         """Return spaCy availability and which models are loaded vs missing."""
         status = {
@@ -172,16 +242,35 @@ class CityExtractor:
         status['missing_models'] = [m for m in self.lang_models if all(m not in (n or '') for n in loaded_names)]
         return status
 
-    def _extract_section(self, text: str, header_keywords: List[str], max_lines: int = None, two_line_tail: Optional[List[str]] = None) -> str:
-        """Extract block of text after any header in header_keywords up to max_lines or next header."""
+    @contextmanager
+    def _extraction_scope(self):
+        """Share section scans and spaCy docs between the helpers of one extraction."""
+        if self._scope_cache is not None:
+            yield
+            return
+        self._scope_cache = {}
+        try:
+            yield
+        finally:
+            self._scope_cache = None
+
+    @_scope_cached
+    def _lines(self, text: str) -> List[str]:
+        """text.splitlines(), split once per extraction scope and shared by all helpers."""
+        return text.splitlines()
+
+    @staticmethod
+    def _alternation(keywords: List[str]) -> re.Pattern:
+        """Compile literal keywords into one case-insensitive alternation."""
+        return re.compile(r"|".join([re.escape(k) for k in keywords]), re.IGNORECASE)
+
+    def _extract_section(self, text: str, header_regex: re.Pattern, tail_regex: Optional[re.Pattern] = None, max_lines: int = None) -> str:
+        """Extract block of text after a header_regex match up to max_lines or next header."""
         if not text:
             return ""
         max_lines = max_lines or CITY_SECTION_MAX_LINES
 
-        # Build header regex (case-insensitive, diacritics variants provided by caller)
-        header_regex = re.compile(r"|".join([re.escape(h) for h in header_keywords]), re.IGNORECASE)
-
-        lines = text.splitlines()
+        lines = self._lines(text)
         for idx, line in enumerate(lines):
             if header_regex.search(line):
                 # capture following lines up to max_lines or until next header-like marker
@@ -194,10 +283,9 @@ class CityExtractor:
                 return "\n".join(block_lines).strip()
 
         # Handle split headers like "Miejsce" on one line and "zaladunku/rozladunku" on the next line
-        if two_line_tail:
-            tail_regex = re.compile(r"|".join([re.escape(t) for t in two_line_tail]), re.IGNORECASE)
+        if tail_regex is not None:
             for idx in range(len(lines) - 1):
-                if re.search(r"\bMiejsce\b", lines[idx], re.IGNORECASE) and tail_regex.search(lines[idx + 1]):
+                if self._miejsce_re.search(lines[idx]) and tail_regex.search(lines[idx + 1]):
                     start = idx + 2
                     end_idx = min(len(lines), start + max_lines)
                     block_lines = []
@@ -210,46 +298,20 @@ class CityExtractor:
         return ""
 
     def _looks_like_header(self, line: str) -> bool:
-        tokens = [
-            "Miejsce załadunku",
-            "Miejsce zaladunku",
-            "Miejsce rozładunku",
-            "Miejsce rozladunku",
-            "Zlecenie",
-            "Samochód",
-            "Samochod",
-            "Vereinbarter Frachtpreis",
-            "Termin rozladunku",
-        ]
-        pattern = re.compile(r"|".join([re.escape(t) for t in tokens]), re.IGNORECASE)
-        return bool(pattern.search(line))
+        return bool(self._stop_header_re.search(line))
 
+    @_scope_cached
     def _regex_city(self, section: str) -> Optional[str]:
         if not section:
             return None
 
         # Prefer lines with PL/DE postal code + city (with or without country prefix)
-        for line in section.splitlines():
-            line = line.strip()
-            if not line:
-                continue
-            # First try zip+city patterns regardless of digit ratio
-            for pattern in (
-                self._pattern_pl_zip_city,
-                self._pattern_de_zip_city,
-                self._pattern_pl_bare_zip_city,
-                self._pattern_de_bare_zip_city,
-            ):
-                m = pattern.search(line)
-                if m:
-                    return self._clean_city(m.group(1))
-
-            # Ignore overly numeric lines (likely addresses or IDs)
-            if sum(c.isdigit() for c in line) > max(3, len(line) // 3):
-                continue
+        zip_cities = self._zip_cities_by_line(section)
+        if zip_cities:
+            return zip_cities[0][1]
 
         # Fallback: any reasonable city-looking token
-        for line in section.splitlines():
+        for line in self._lines(section):
             line = line.strip()
             if not line:
                 continue
@@ -265,8 +327,7 @@ class CityExtractor:
     def _ner_city(self, section: str) -> Optional[str]:
         if not section or not self.use_spacy:
             return None
-        nlp_pipes = self._ensure_models()
-        if not nlp_pipes:
+        if not self._ensure_models():
             return None
 
         # If the section already contains a ZIP+city, trust regex result
@@ -275,9 +336,8 @@ class CityExtractor:
             return zip_city
 
         scored: List[Tuple[float, str]] = []
-        for nlp in nlp_pipes:
+        for doc in self._section_docs(section):
             try:
-                doc = nlp(section)
                 for ent in doc.ents:
                     score = self._score_ner_candidate(ent)
                     if score <= 0:
@@ -288,36 +348,22 @@ class CityExtractor:
 
         if not scored:
             return None
-        scored.sort(key=lambda x: (x[0], len(x[1])), reverse=True)
-        return scored[0][1]
+        return max(scored, key=lambda x: (x[0], len(x[1])))[1]
 
+    @_scope_cached
     def _extract_cities_list(self, section: str) -> List[str]:
         """Extract multiple cities from a section, ordered top-to-bottom, unique.
         Prefers ZIP+city patterns. Falls back to NER-scored candidates if no ZIP found.
         """
-        lines = section.splitlines()
+        lines = self._lines(section)
         found: List[str] = []
         seen = set()
 
         # First pass: ZIP+city matches (with/without country prefix)
-        zip_patterns = (
-            self._pattern_pl_zip_city,
-            self._pattern_de_zip_city,
-            self._pattern_pl_bare_zip_city,
-            self._pattern_de_bare_zip_city,
-        )
-        for line in lines:
-            s = line.strip()
-            if not s:
-                continue
-            for pat in zip_patterns:
-                m = pat.search(s)
-                if m:
-                    city = self._clean_city(m.group(1))
-                    if city and city not in seen:
-                        seen.add(city)
-                        found.append(city)
-                    break
+        for _, city in self._zip_cities_by_line(section):
+            if city and city not in seen:
+                seen.add(city)
+                found.append(city)
 
         if found:
             return found
@@ -338,13 +384,9 @@ class CityExtractor:
             return found
 
         # Last resort: NER candidates scored; keep order as they appear
-        nlp_pipes = self._ensure_models()
-        if not nlp_pipes:
-            return []
         scored_seq: List[Tuple[float, str]] = []
-        for nlp in nlp_pipes:
+        for doc in self._section_docs(section):
             try:
-                doc = nlp(section)
                 for ent in doc.ents:
                     score = self._score_ner_candidate(ent)
                     if score <= 0:
@@ -364,42 +406,105 @@ class CityExtractor:
                 result.append(city)
         return result
 
+    @_scope_cached
+    def _zip_cities_by_line(self, block: str) -> List[Tuple[int, str]]:
+        """Return (line index, city) for every line of block holding a PL/DE ZIP + city.
+
+        A single finditer over the whole block finds the ZIP lines; only those lines
+        are re-checked against the individual patterns to keep their priority order.
+        """
+        found: List[Tuple[int, str]] = []
+        lines = self._lines(block)
+        for idx in self._zip_line_candidates(block):
+            line = lines[idx].strip()
+            for pattern in self._zip_patterns:
+                zm = pattern.search(line)
+                if zm:
+                    found.append((idx, self._clean_city(zm.group(1))))
+                    break
+        return found
+
+    def _zip_line_candidates(self, block: str) -> List[int]:
+        """Return ascending indices of the lines of block that may hold a ZIP + city."""
+        encoded = None
+        # Hyperscan's Unicode tables lack the newer astral-plane digits; `re` handles those blocks
+        if self._hs_zip_db is not None and max(block, default="") <= "\uffff":
+            try:
+                encoded = [line.encode("utf-8") for line in block.splitlines(keepends=True)]
+            except UnicodeEncodeError:
+                pass  # lone surrogates aren't valid UTF-8 for hyperscan; use the `re` scan
+        if encoded is not None:
+            byte_ends = list(accumulate(len(b) for b in encoded))
+            hits = set()
+
+            def on_match(_id, _start, end, _flags, _context):
+                hits.add(bisect_right(byte_ends, end - 1))
+
+            self._hs_zip_db.scan(b"".join(encoded), match_event_handler=on_match)
+            return sorted(hits)
+
+        indices: List[int] = []
+        line_ends = None
+        for m in self._pattern_zip_any.finditer(block):
+            if line_ends is None:
+                # Offsets need the real line-break widths, hence keepends
+                line_ends = list(accumulate(len(line) for line in block.splitlines(keepends=True)))
+            idx = bisect_right(line_ends, m.start())
+            if not indices or indices[-1] != idx:
+                indices.append(idx)
+        return indices
+
+    @staticmethod
+    def _build_hyperscan_db():
+        """Compile the core of the ZIP patterns (NN-NNN / NNNN) into a hyperscan DB.
+
+        Hyperscan only narrows down candidate lines; the exact patterns still decide
+        per line, so any line it flags without a real ZIP + city is dropped there.
+        UTF8 | UCP make \\d match Unicode digits like `re`'s str patterns do.
+        """
+        if hyperscan is None:
+            return None
+        try:
+            flags = hyperscan.HS_FLAG_UTF8 | hyperscan.HS_FLAG_UCP
+            db = hyperscan.Database()
+            db.compile(expressions=[rb"\d{2}-\d{3}", rb"\d{4}"], ids=[0, 1], elements=2, flags=[flags, flags])
+            return db
+        except Exception:
+            return None
+
     def _clean_city(self, raw: str) -> str:
         if not raw:
             return ""
-        s = raw
+        # The same few cities recur across a batch; memoize the cleaned form
+        cleaned = self._clean_cache.get(raw)
+        if cleaned is None:
+            if len(self._clean_cache) >= _CLEAN_CACHE_SIZE:
+                self._clean_cache.clear()
+            cleaned = self._clean_cache[raw] = self._clean_city_uncached(raw)
+        return cleaned
+
+    def _clean_city_uncached(self, raw: str) -> str:
         # Remove postal codes and country prefixes
-        s = re.sub(r"\b(?:PL|D|D-)\s?\d{2}-?\d{3,5}\s*", "", s, flags=re.IGNORECASE)
-        s = re.sub(r"\b\d{2}-?\d{3,5}\b", "", s)
-
-        # Split off notes or trailing annotations
-        split_tokens = ["na zlec", "auftr", "auftrag", "attn"]
-        for tok in split_tokens:
-            s = s.split(tok, 1)[0]
-        # Also cut on separators
-        s = re.split(r"[;,|]", s)[0]
-
-        # Normalize whitespace
-        s = re.sub(r"\s+", " ", s).strip()
+        s = self._clean_zip_re.sub("", raw)
+        s = self._clean_bare_zip_re.sub("", s)
 
-        # Title-case but keep dots and umlauts relatively intact
-        def smart_title(t: str) -> str:
-            parts = [p.capitalize() if not p.endswith('.') else p[:-1].capitalize() + '.' for p in t.split(' ')]
-            return " ".join(parts)
+        # Split off notes or trailing annotations and cut on separators
+        s = self._clean_cut_re.split(s, 1)[0]
 
-        # Preserve common abbrev like 'b.'
-        s = smart_title(s)
-        return s
+        # Normalize whitespace and title-case, keeping dots and umlauts relatively intact
+        # (preserves common abbrev like 'b.')
+        return " ".join(
+            p.capitalize() if not p.endswith('.') else p[:-1].capitalize() + '.' for p in s.split()
+        )
 
     def _looks_like_street(self, line: str) -> bool:
-        low = line.lower()
-        return any(tok in low for tok in self._street_tokens)
+        return self._street_re.search(line.lower()) is not None
 
     def _score_ner_candidate(self, ent) -> float:
         """Score spaCy entity: prefer cities, penalize streets/orgs, reject digits."""
         label = ent.label_.upper()
         text_val = ent.text.strip()
-        if any(ch.isdigit() for ch in text_val):
+        if any(map(str.isdigit, text_val)):
             return 0.0
         if self._looks_like_street(text_val):
             return 0.0
@@ -416,8 +521,49 @@ class CityExtractor:
         base += min(len(text_val) / 40.0, 0.3)
         return base
 
-    def _choose_best(self, primary: Optional[str], secondary: Optional[str]) -> Optional[str]:
-        return primary or secondary
+    def _choose_best(self, section: str) -> Optional[str]:
+        """Regex city if found, otherwise NER (models are only touched when regex fails)."""
+        return self._regex_city(section) or self._ner_city(section)
+
+    @_scope_cached
+    def _section_docs(self, section: str) -> list:
+        """Run every loaded pipeline over section (once per extraction scope)."""
+        if not section or not self.use_spacy:
+            return []
+        docs = []
+        for nlp in self._ensure_models():
+            try:
+                docs.append(nlp(section))
+            except Exception:
+                continue
+        return docs
+
+    def _prime_docs(self, sections: List[str]) -> None:
+        """Parse sections with one nlp.pipe() call per model and store them for _section_docs."""
+        cache = self._scope_cache
+        if cache is None or not self.use_spacy:
+            return
+        todo = [s for s in dict.fromkeys(sections) if s and ('_section_docs', s) not in cache]
+        pipes = self._ensure_models() if todo else []
+        if not pipes:
+            return
+        docs_per_section: List[list] = [[] for _ in todo]
+        for nlp in pipes:
+            try:
+                docs = list(nlp.pipe(todo, batch_size=SPACY_BATCH_SIZE))
+            except Exception:
+                # Fall back to one call per section so a single bad section is skipped alone
+                docs = []
+                for section in todo:
+                    try:
+                        docs.append(nlp(section))
+                    except Exception:
+                        docs.append(None)
+            for section_docs, doc in zip(docs_per_section, docs):
+                if doc is not None:
+                    section_docs.append(doc)
+        for section, section_docs in zip(todo, docs_per_section):
+            cache[('_section_docs', section)] = section_docs
 
     def _ensure_models(self):
         if not self.use_spacy or spacy is None:
@@ -428,42 +574,65 @@ class CityExtractor:
         pipelines = []
         for model_name in self.lang_models:
             try:
-                pipelines.append(spacy.load(model_name))
+                # NER-only pipeline: exclude (unlike disable) skips deserializing the other components
+                nlp = spacy.load(model_name, exclude=SPACY_EXCLUDED_PIPES)
+                self._drop_unused_tok2vec(nlp)
+                pipelines.append(nlp)
             except Exception:
                 # Skip missing models silently; regex will still work
                 continue
         self._nlp_pipelines = pipelines
         return self._nlp_pipelines
 
-    def _find_global_city_candidates(self, text: str) -> List[str]:
-        """Find all postal-code+city or city-only candidates in order of appearance (best-effort)."""
+    @staticmethod
+    def _drop_unused_tok2vec(nlp) -> None:
+        """Remove the shared tok2vec if ner doesn't listen to it (ner then embeds tokens itself)."""
+        try:
+            if "tok2vec" in nlp.pipe_names and "ner" not in nlp.get_pipe("tok2vec").listening_components:
+                nlp.remove_pipe("tok2vec")
+        except Exception:
+            pass  # keep the pipeline as loaded
+
+    def _global_fallback(
+        self, text: str, loading_city: Optional[str], unloading_city: Optional[str]
+    ) -> Tuple[Optional[str], Optional[str]]:
+        """Fill missing cities from the whole text: first candidate for loading, last for unloading."""
+        if unloading_city is None:
+            candidates = self._find_global_city_candidates(text)
+            if candidates:
+                if loading_city is None:
+                    loading_city = candidates[0]
+                unloading_city = candidates[-1]
+        elif loading_city is None:
+            # Only the first candidate is needed, so stop scanning at it
+            loading_city = next(filter(None, self._iter_global_city_candidates(text)), None)
+        return loading_city, unloading_city
+
+    def _iter_global_city_candidates(self, text: str) -> Iterator[str]:
+        """Yield postal-code+city or city-only candidates line by line (may repeat or be empty)."""
         if not text:
-            return []
-        candidates: List[str] = []
-        for line in text.splitlines():
+            return
+        # Prefer PL/DE code + city (with or without country prefix)
+        zip_cities = dict(self._zip_cities_by_line(text))
+        for idx, line in enumerate(self._lines(text)):
+            if idx in zip_cities:
+                yield zip_cities[idx]
+                continue
             line = line.strip()
             if not line:
                 continue
-            # Prefer PL/DE code + city (with or without country prefix)
-            for pattern in (
-                self._pattern_pl_zip_city,
-                self._pattern_de_zip_city,
-                self._pattern_pl_bare_zip_city,
-                self._pattern_de_bare_zip_city,
-            ):
-                m = pattern.search(line)
-                if m:
-                    candidates.append(self._clean_city(m.group(1)))
-                    break
-            else:
-                # consider city-only as a last resort
-                m2 = self._pattern_city_only.search(line)
-                if m2:
-                    candidates.append(self._clean_city(m2.group(1)))
+            # consider city-only as a last resort
+            m2 = self._pattern_city_only.search(line)
+            if m2:
+                yield self._clean_city(m2.group(1))
+
+    @_scope_cached
+    def _find_global_city_candidates(self, text: str) -> List[str]:
+        """Find all postal-code+city or city-only candidates in order of appearance (best-effort)."""
         # Deduplicate preserving order
         seen = set()
         unique: List[str] = []
-        for c in candidates:
+        for c in self._iter_global_city_candidates(text):
             if c and c not in seen:
                 seen.add(c)
                 unique.append(c)
@@ -471,17 +640,15 @@ class CityExtractor:
 
     def _find_global_ner_candidates(self, text: str) -> List[str]:
         """Collect spaCy LOC/GPE candidates from the whole text in order of appearance."""
-        nlp_pipes = self._ensure_models()
-        if not nlp_pipes:
+        if not text or not self.use_spacy:
             return []
         found: List[str] = []
-        for nlp in nlp_pipes:
+        for doc in self._section_docs(text):
             try:
-                doc = nlp(text)
                 for ent in doc.ents:
                     if ent.label_.upper() in {"LOC", "GPE", "PLACE"}:
                         val = ent.text.strip()
-                        if any(ch.isdigit() for ch in val):
+                        if any(map(str.isdigit, val)):
                             continue
                         found.append(self._clean_city(val))
             except Exception:
@@ -2,9 +2,15 @@
 """Data processing and grouping module"""
 
 import json
+import math
 from collections import defaultdict
 from utils.helpers import print_header, print_separator
 
+try:
+    import orjson  # type: ignore
+except Exception:
+    orjson = None  # optional fast serializer; stdlib json is used otherwise
+
 
 class DataProcessor:
     """Process and group extracted data"""
@@ -30,6 +36,11 @@ class DataProcessor:
         
         return dict(grouped), no_plate
     
+    @staticmethod
+    def fracht_total(records):
+        """Sum the fracht of records (math.fsum: exact, no float drift)"""
+        return math.fsum(r.get('fracht', 0) or 0 for r in records)
+    
     def display_grouped_results(self, grouped, no_plate):
         """Display results grouped by plate"""
         print_header("📊 RESULTS BY LICENSE PLATE")
@@ -43,7 +54,6 @@ class DataProcessor:
             print(f"{'Nr Zlecenia':<15} {'Loading City':<40} {'Unloading City':<60} {'Data':<12} {'Fracht':<10} {'Plik':<30}")
             print_separator()
             
-            total_fracht = 0
             for rec in records:
                 zlecenie = rec.get('zlecenie_nr', 'N/A')
                 loading_city = rec.get('miejsce_zaladunku') or '—'
@@ -53,8 +63,8 @@ class DataProcessor:
                 file = rec.get('source_file', 'N/A')[:28]
                 
                 print(f"{zlecenie:<15} {loading_city:<40} {unloading_city:<60} {date:<12} {fracht:<10.2f} {file:<30}")
-                total_fracht += fracht
             
+            total_fracht = self.fracht_total(records)
             print_separator()
             print(f"{'TOTAL:':<15} {'':<12} {total_fracht:<10.2f} EUR")
         
@@ -86,16 +96,14 @@ class DataProcessor:
         """Display total fracht by plate"""
         print_header("💰 TOTAL FRACHT BY PLATE")
         
-        # Sort by total fracht descending
-        sorted_plates = sorted(
-            grouped.items(),
-            key=lambda x: sum(r.get('fracht', 0) or 0 for r in x[1]),
-            reverse=True
-        )
+        # One pass per plate for the totals, then sort by total fracht descending
+        totals = [
+            (plate, self.fracht_total(records), len(records))
+            for plate, records in grouped.items()
+        ]
+        totals.sort(key=lambda x: x[1], reverse=True)
         
-        for plate, records in sorted_plates:
-            total = sum(r.get('fracht', 0) or 0 for r in records)
-            count = len(records)
+        for plate, total, count in totals:
             avg = total / count if count > 0 else 0
             print(f"{plate:<12} : {total:>8.2f} EUR ({count} zleceń, avg: {avg:.2f} EUR)")
     
@@ -107,7 +115,12 @@ class DataProcessor:
             'no_plate': no_plate
         }
         
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        if orjson is not None:
+            # Same layout as json.dump(indent=2, ensure_ascii=False), serialized in one native pass
+            with open(output_file, 'wb') as f:
+                f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+        else:
+            with open(output_file, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=2, ensure_ascii=False)
         
         print(f"\n💾 Results saved to: {output_file}")
\ No newline at end of file
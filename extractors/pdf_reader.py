@@ -2,7 +2,17 @@
 """PDF text extraction module"""
 
 import PyPDF2
+import hashlib
+import io
 import os
+import time
+from utils.helpers import is_pdf_name
+from config import USE_PDFIUM, PDF_TEXT_CACHE_DIR, PDF_TEXT_CACHE_MAX_AGE_DAYS
+
+try:
+    import pypdfium2 as pdfium  # type: ignore
+except Exception:
+    pdfium = None  # optional native text extraction; PyPDF2 is used otherwise
 
 
 class PDFReader:
@@ -17,27 +27,156 @@ class PDFReader:
             print(f"❌ Folder '{self.pdfs_folder}' does not exist!")
             return []
         
-        pdf_files = [
-            f for f in os.listdir(self.pdfs_folder) 
-            if f.lower().endswith('.pdf')
-        ]
+        # scandir's dirent type lets is_file() skip folders without an extra stat
+        with os.scandir(self.pdfs_folder) as entries:
+            pdf_files = [
+                e.name for e in entries
+                if is_pdf_name(e.name) and e.is_file()
+            ]
         
         return sorted(pdf_files)
     
-    def extract_text(self, pdf_path):
-        """Extract text from a PDF file"""
-        try:
-            with open(pdf_path, 'rb') as file:
-                reader = PyPDF2.PdfReader(file)
-                text = ""
-                
-                for page in reader.pages:
-                    text += page.extract_text() + "\n"
-                
+    def list_pdf_entries(self):
+        """Get sorted (file name, size in KB) pairs for all PDF files in folder"""
+        if not os.path.exists(self.pdfs_folder):
+            print(f"❌ Folder '{self.pdfs_folder}' does not exist!")
+            return []
+        
+        pdf_entries = []
+        with os.scandir(self.pdfs_folder) as entries:
+            for e in entries:
+                if not (is_pdf_name(e.name) and e.is_file()):
+                    continue
+                try:
+                    size = e.stat().st_size / 1024
+                except OSError:
+                    size = 0
+                pdf_entries.append((e.name, size))
+        
+        return sorted(pdf_entries)
+    
+    def extract_text(self, pdf_path, pdf_bytes=None, pdf_stat=None):
+        """Extract text from a PDF file (or from its contents, if already read)
+        
+        pdf_stat is the os.fstat() of the handle pdf_bytes were read from. It keys
+        the text cache, so contents passed without it are neither looked up nor cached.
+        """
+        use_pdfium = USE_PDFIUM and pdfium is not None
+        
+        # Unchanged PDFs (same path, mtime and size) are served from the text cache
+        if pdf_bytes is None or pdf_stat is not None:
+            text = self._read_cached_text(self._text_cache_file(pdf_path, use_pdfium, pdf_stat))
+            if text is not None:
                 return text
         
+        try:
+            if pdf_bytes is None:
+                # One read, instead of PyPDF2's many small seeks and reads on the file;
+                # the stat of the same handle keys the cache, so it always matches the bytes
+                with open(pdf_path, 'rb') as file:
+                    pdf_stat = os.fstat(file.fileno())
+                    pdf_bytes = file.read()
+            
+            if use_pdfium:
+                text = self._extract_pages_pdfium(pdf_bytes)
+            else:
+                text = self._extract_pages(io.BytesIO(pdf_bytes))
+        
         except Exception as e:
             raise Exception(f"Error reading PDF: {e}")
+        
+        if pdf_stat is not None:
+            cache_file = self._text_cache_file(pdf_path, use_pdfium, pdf_stat)
+            if cache_file is not None:
+                self._store_text(cache_file, text)
+        
+        return text
+    
+    def has_cached_text(self, pdf_path):
+        """Whether extract_text() can serve this PDF from the text cache"""
+        cache_file = self._text_cache_file(pdf_path, USE_PDFIUM and pdfium is not None)
+        return cache_file is not None and os.path.exists(cache_file)
+    
+    def _text_cache_file(self, pdf_path, use_pdfium, st=None):
+        """Path of the text cache entry for the PDF version st describes (None = no caching)"""
+        if not PDF_TEXT_CACHE_DIR:
+            return None
+        if st is None:
+            try:
+                st = os.stat(pdf_path)
+            except OSError:
+                return None  # extraction reports the error
+        
+        backend = "pdfium" if use_pdfium else "pypdf2"
+        key = os.fsencode(os.path.abspath(pdf_path)) + f"|{st.st_mtime_ns}|{st.st_size}|{backend}".encode()
+        return os.path.join(PDF_TEXT_CACHE_DIR, hashlib.sha1(key).hexdigest() + ".txt")
+    
+    def _read_cached_text(self, cache_file):
+        """Text of a cache entry, or None if there is no usable entry"""
+        if cache_file is None:
+            return None
+        try:
+            # PyPDF2 text may hold lone surrogates (CMaps are decoded with surrogatepass)
+            with open(cache_file, 'r', encoding='utf-8', errors='surrogatepass', newline='') as f:
+                text = f.read()
+            os.utime(cache_file)  # keep entries in use from being pruned
+            return text
+        except (OSError, UnicodeError):
+            return None
+    
+    def _store_text(self, cache_file, text):
+        """Write a text cache entry atomically (worker processes may share the folder)"""
+        tmp_file = f"{cache_file}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(PDF_TEXT_CACHE_DIR, exist_ok=True)
+            with open(tmp_file, 'w', encoding='utf-8', errors='surrogatepass', newline='') as f:
+                f.write(text)
+            os.replace(tmp_file, cache_file)
+        except (OSError, UnicodeError):
+            # Caching is best effort; don't leave a partial entry behind
+            try:
+                os.unlink(tmp_file)
+            except OSError:
+                pass
+    
+    @staticmethod
+    def prune_text_cache():
+        """Delete text cache entries unused for PDF_TEXT_CACHE_MAX_AGE_DAYS (edited, moved or old PDFs)"""
+        if not PDF_TEXT_CACHE_DIR:
+            return
+        cutoff = time.time() - PDF_TEXT_CACHE_MAX_AGE_DAYS * 86400
+        try:
+            with os.scandir(PDF_TEXT_CACHE_DIR) as entries:
+                for e in entries:
+                    try:
+                        if e.is_file() and e.stat().st_mtime < cutoff:
+                            os.unlink(e.path)
+                    except OSError:
+                        continue
+        except OSError:
+            pass  # no cache folder yet
+    
+    def _extract_pages(self, file):
+        """Extract text of all pages from an open PDF stream"""
+        reader = PyPDF2.PdfReader(file)
+        chunks = [page.extract_text() for page in reader.pages]
+        
+        return "".join(chunk + "\n" for chunk in chunks)
+    
+    def _extract_pages_pdfium(self, source):
+        """Extract text of all pages with PDFium (source is a path or the file's bytes)"""
+        pdf = pdfium.PdfDocument(source)
+        try:
+            chunks = []
+            for page in pdf:
+                textpage = page.get_textpage()
+                # PDFium ends lines with \r\n; PyPDF2 output (and the regexes) use \n
+                chunks.append(textpage.get_text_range().replace("\r\n", "\n"))
+                textpage.close()
+                page.close()
+            return "".join(chunk + "\n" for chunk in chunks)
+        finally:
+            pdf.close()
     
     def get_file_size(self, pdf_path):
         """Get file size in KB"""
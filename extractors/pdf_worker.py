@@ -0,0 +1,142 @@
+# extractors/pdf_worker.py
+"""Per-PDF extraction, run in worker processes for batch jobs"""
+
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from extractors.pdf_reader import PDFReader
+from extractors.regex_extractor import RegexExtractor
+from extractors.city_extractor import CityExtractor
+from config import MAX_WORKERS, PARALLEL_MIN_PDFS
+
+# Extractors of the current process, built once by worker_init()
+_pdf_reader = None
+_regex_extractor = None
+_city_extractor = None
+
+# Extracted fields by PDF text, per process (reset once it holds _FIELDS_CACHE_SIZE texts)
+_fields_cache = {}
+_FIELDS_CACHE_SIZE = 256
+
+# Fields that repeat across orders (same truck, same routes), interned in the calling process
+_INTERNED_FIELDS = ('tablica_rejestracyjna', 'termin_rozladunku', 'miejsce_zaladunku', 'miejsce_rozladunku')
+
+# Pool shared by successive batches, so its workers keep their extractors and loaded models
+_executor = None
+_executor_workers = 0
+
+
+def worker_init():
+    """Build the extractors once per process and load the spaCy models up front"""
+    global _pdf_reader, _regex_extractor, _city_extractor
+    _pdf_reader = PDFReader(None)  # only extract_text() is used, with full paths
+    _regex_extractor = RegexExtractor()
+    _city_extractor = CityExtractor(use_spacy=True)
+    _city_extractor.warmup()
+
+
+def worker_process(pdf_path, pdf_bytes=None, pdf_stat=None):
+    """Extract all fields from one PDF (optionally already read) and return the data dict"""
+    if _regex_extractor is None:
+        worker_init()
+
+    text = _pdf_reader.extract_text(pdf_path, pdf_bytes, pdf_stat)
+
+    # Resent orders yield identical text; reuse their fields instead of re-running NER
+    fields = _fields_cache.get(text)
+    if fields is None:
+        fields = _regex_extractor.extract_all_fields(text, verbose=False)
+        loading_city, unloading_city = _city_extractor.extract_from_text(text)
+        fields['miejsce_zaladunku'] = loading_city
+        fields['miejsce_rozladunku'] = unloading_city
+        if len(_fields_cache) >= _FIELDS_CACHE_SIZE:
+            _fields_cache.clear()
+        _fields_cache[text] = fields
+
+    data = dict(fields)
+    data['source_file'] = os.path.basename(pdf_path)
+
+    return data
+
+
+def _intern_fields(data):
+    """Share one string object per distinct plate/date/city across a batch's results"""
+    for key in _INTERNED_FIELDS:
+        value = data.get(key)
+        if type(value) is str:
+            data[key] = sys.intern(value)
+    return data
+
+
+def _read_file(path):
+    """Read a whole file (prefetch helper, runs in a thread)
+
+    Returns (bytes, stat of the same handle), or (None, None) for PDFs whose text
+    is cached - extract_text() won't need the bytes.
+    """
+    if _pdf_reader.has_cached_text(path):
+        return None, None
+    with open(path, 'rb') as file:
+        return file.read(), os.fstat(file.fileno())
+
+
+def _get_executor(workers):
+    """Return the shared process pool, (re)creating it for a new worker count"""
+    global _executor, _executor_workers
+    if _executor is None or _executor_workers != workers:
+        if _executor is not None:
+            _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = ProcessPoolExecutor(max_workers=workers, initializer=worker_init)
+        _executor_workers = workers
+    return _executor
+
+
+def process_pdfs(pdf_paths, max_workers=None):
+    """Yield (pdf_path, data, error) for every PDF, in input order
+
+    Small batches run in the calling process; larger ones are spread over
+    a process pool, so regex and spaCy work uses all cores.
+    """
+    global _executor
+    pdf_paths = list(pdf_paths)
+    workers = max_workers or MAX_WORKERS or os.cpu_count() or 1
+
+    PDFReader.prune_text_cache()
+
+    if workers <= 1 or len(pdf_paths) < PARALLEL_MIN_PDFS:
+        if _regex_extractor is None:
+            worker_init()  # the prefetch thread checks the text cache through _pdf_reader
+        # Read the next PDF from disk while the current one is being extracted
+        with ThreadPoolExecutor(max_workers=1) as prefetch:
+            pending = [prefetch.submit(_read_file, pdf_path) for pdf_path in pdf_paths[:1]]
+            for i, pdf_path in enumerate(pdf_paths):
+                current = pending.pop()
+                if i + 1 < len(pdf_paths):
+                    pending.append(prefetch.submit(_read_file, pdf_paths[i + 1]))
+                try:
+                    pdf_bytes, pdf_stat = current.result()
+                except OSError:
+                    pdf_bytes, pdf_stat = None, None  # extract_text() reports the error
+                try:
+                    yield pdf_path, _intern_fields(worker_process(pdf_path, pdf_bytes, pdf_stat)), None
+                except Exception as e:
+                    yield pdf_path, None, e
+        return
+
+    executor = _get_executor(workers)
+    futures = [executor.submit(worker_process, pdf_path) for pdf_path in pdf_paths]
+    try:
+        for pdf_path, future in zip(pdf_paths, futures):
+            try:
+                # Unpickled results carry fresh copies of every string
+                yield pdf_path, _intern_fields(future.result()), None
+            except Exception as e:
+                if isinstance(e, BrokenProcessPool) and _executor is executor:
+                    _executor = None  # a worker died; the next batch starts a fresh pool
+                yield pdf_path, None, e
+    finally:
+        # Caller stopped early - don't start the remaining PDFs
+        for future in futures:
+            future.cancel()
@@ -6,6 +6,37 @@ from utils.helpers import format_date, clean_plate_number
 from config import FRACHT_MIN, FRACHT_MAX
 
 
+# Patterns are compiled once at import, in priority order (first match wins)
+_ORDER_PATTERNS = tuple(re.compile(p, re.IGNORECASE) for p in (
+    r'Zlecenie\s+Nr\.?\s*(\d{2}/\d{4}[A-Z])',
+    r'Speditionsauftrag\s+Nr\.?\s*(\d{2}/\d{4}[A-Z])',
+    r'Nr\.?\s*(\d{2}/\d{4}[A-Z])',
+))
+
+_DATE_PATTERNS = tuple(re.compile(p, re.IGNORECASE) for p in (
+    r'Termin\s+rozładunku[:\s]+(\d{2}\.\d{2}\.\d{4})',
+    r'Termin\s+rozladunku[:\s]+(\d{2}\.\d{2}\.\d{4})',
+    r'Entladetermin\s*:?\s*(\d{2}\.\d{2}\.\d{4})',
+    r'(?:Entlade|rozlad)[^\d]*(\d{2}\.\d{2}\.\d{4})',
+))
+
+_PLATE_PATTERNS = tuple(re.compile(p, re.IGNORECASE | re.DOTALL) for p in (
+    r'Samoch[oó]d\s*:\s*(P[LPN]\d{4,5}[A-Z]?)',
+    r'Samoch[oó]d\s*:.*?(P[LPN]\d{4,5}[A-Z])',
+    r'LKW-Nr\.?\s*:?\s*(P[LPN]\d{4,5}[A-Z]?)',
+    r'\b(P[LPN]\d{4,5}[A-Z]?)(?:/[A-Z0-9]+)?\b',
+))
+
+_FRACHT_PATTERNS = tuple(re.compile(p, re.IGNORECASE | re.DOTALL) for p in (
+    r'Vereinbarter\s+Frachtpreis.*?(\d{1,2}[\.\s]?\d{3},\d{2})\s*€',
+    r'uzgodniony\s+Fracht.*?(\d{1,2}[\.\s]?\d{3},\d{2})\s*€',
+    r'Vereinbarter\s+Frachtpreis.*?(\d{3,4},\d{2})\s*€',
+    r'uzgodniony\s+Fracht.*?(\d{3,4},\d{2})\s*€',
+    r'Frachtpreis.*?(\d{1,2}[\.\s]?\d{3},\d{2})\s*€',
+    r'Frachtpreis.*?(\d{3,4},\d{2})\s*€',
+))
+
+
 class RegexExtractor:
     """Extract structured data using regex patterns (Polish + German support)"""
     
@@ -33,14 +64,8 @@ class RegexExtractor:
         Polish: Zlecenie Nr. 25/3661A
         German: Speditionsauftrag Nr. 25/3661A
         """
-        patterns = [
-            r'Zlecenie\s+Nr\.?\s*(\d{2}/\d{4}[A-Z])',
-            r'Speditionsauftrag\s+Nr\.?\s*(\d{2}/\d{4}[A-Z])',
-            r'Nr\.?\s*(\d{2}/\d{4}[A-Z])',
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
+        for pattern in _ORDER_PATTERNS:
+            match = pattern.search(text)
             if match:
                 result = match.group(1)
                 if verbose:
@@ -57,15 +82,8 @@ class RegexExtractor:
         Polish: Termin rozładunku: 24.11.2025
         German: Entladetermin: 24.11.2025
         """
-        patterns = [
-            r'Termin\s+rozładunku[:\s]+(\d{2}\.\d{2}\.\d{4})',
-            r'Termin\s+rozladunku[:\s]+(\d{2}\.\d{2}\.\d{4})',
-            r'Entladetermin\s*:?\s*(\d{2}\.\d{2}\.\d{4})',
-            r'(?:Entlade|rozlad)[^\d]*(\d{2}\.\d{2}\.\d{4})',
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
+        for pattern in _DATE_PATTERNS:
+            match = pattern.search(text)
             if match:
                 date_str = match.group(1)
                 formatted = format_date(date_str)
@@ -83,23 +101,14 @@ class RegexExtractor:
         Polish: Samochód: PP7706U
         German: LKW-Nr.: PP7706U
         """
-        patterns = [
-            r'Samoch[oó]d\s*:\s*(P[LPN]\d{4,5}[A-Z]?)',
-            r'Samoch[oó]d\s*:.*?(P[LPN]\d{4,5}[A-Z])',
-            r'LKW-Nr\.?\s*:?\s*(P[LPN]\d{4,5}[A-Z]?)',
-            r'\b(P[LPN]\d{4,5}[A-Z]?)(?:/[A-Z0-9]+)?\b',
-        ]
-        
-        for i, pattern in enumerate(patterns, 1):
-            match = re.search(pattern, text, re.IGNORECASE | re.DOTALL)
+        for i, pattern in enumerate(_PLATE_PATTERNS, 1):
+            match = pattern.search(text)
             if match:
-                plate = match.group(1)
-                
-                if re.match(r'P[LPN]\d{4,5}[A-Z]?', plate, re.IGNORECASE):
-                    cleaned = clean_plate_number(plate)
-                    if verbose:
-                        print(f"✅ Tablica: {cleaned} (pattern {i})")
-                    return cleaned
+                # Every pattern captures the full P[LPN]\d{4,5}[A-Z]? plate shape itself
+                cleaned = clean_plate_number(match.group(1))
+                if verbose:
+                    print(f"✅ Tablica: {cleaned} (pattern {i})")
+                return cleaned
         
         if verbose:
             print(f"❌ Tablica: NOT FOUND")
@@ -111,17 +120,8 @@ class RegexExtractor:
         Polish: uzgodniony Fracht: 950,00 €
         German: Vereinbarter Frachtpreis: 950,00 € all in
         """
-        patterns = [
-            r'Vereinbarter\s+Frachtpreis.*?(\d{1,2}[\.\s]?\d{3},\d{2})\s*€',
-            r'uzgodniony\s+Fracht.*?(\d{1,2}[\.\s]?\d{3},\d{2})\s*€',
-            r'Vereinbarter\s+Frachtpreis.*?(\d{3,4},\d{2})\s*€',
-            r'uzgodniony\s+Fracht.*?(\d{3,4},\d{2})\s*€',
-            r'Frachtpreis.*?(\d{1,2}[\.\s]?\d{3},\d{2})\s*€',
-            r'Frachtpreis.*?(\d{3,4},\d{2})\s*€',
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, text, re.IGNORECASE | re.DOTALL)
+        for pattern in _FRACHT_PATTERNS:
+            match = pattern.search(text)
             if match:
                 fracht_str = match.group(1)
                 fracht_str = fracht_str.replace('.', '').replace(' ', '').replace(',', '.')
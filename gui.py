@@ -7,18 +7,19 @@ Cross-platform desktop application for processing transport PDFs
 
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox, scrolledtext
+from tkinter import font as tkfont
 import threading
 import os
+from collections import deque
 import sys
 import json
-from datetime import datetime
 from pathlib import Path
 
 # Import existing modules
-from extractors.pdf_reader import PDFReader
-from extractors.regex_extractor import RegexExtractor
 from extractors.data_processor import DataProcessor
-from extractors.city_extractor import CityExtractor
+# extractors.pdf_worker (spaCy, PyPDF2) is imported in the background by _warmup_extractors()
+from config import REQUIRED_FIELDS
+from utils.helpers import is_pdf_name
 # from extractors.google_sheets_exporter import GoogleSheetsExporter
 # from config import GOOGLE_SHEET_ID, CREDENTIALS_FILE, ENABLE_SHEETS_EXPORT
 
@@ -31,6 +32,7 @@ class TransportGUI:
         self.window.title("Transport Document Processor")
         self.window.geometry("1100x750")  # Bigger window for bigger buttons
         self.window.resizable(True, True)
+        self.window.protocol("WM_DELETE_WINDOW", self._on_close)
         
         # Colors
         self.BG_COLOR = "#f5f5f5"
@@ -39,17 +41,28 @@ class TransportGUI:
         self.ERROR = "#f44336"
         self.WARNING = "#FF9800"
         
+        # Log area refresh: every LOG_PUMP_MS, up to LOG_PUMP_BATCH lines at once
+        self.LOG_PUMP_MS = 50
+        self.LOG_PUMP_BATCH = 200
+        
         # State
         self.processing = False
         self.stop_requested = False
+        self._config = self._load_config()  # gui_config.json, written back by _on_close()
+        self._config_dirty = False
         self.current_folder = self.load_last_folder()
+        self._log_queue = deque()  # (message, tag) pairs, drained by _log_pump()
+        self._progress = 0  # percent of PDFs done (set by the processing thread)
+        self._shown_progress = 0  # value last put on the progress bar by _log_pump()
+        self._pdf_cache = None  # sorted PDF names, see _get_pdf_files()
+        self._pdf_cache_key = None  # (folder, folder mtime) the cache was built for
         
         # Components
         self.pdf_reader = None
-        self.regex_extractor = RegexExtractor()
         self.data_processor = DataProcessor()
-        self.city_extractor = CityExtractor(use_spacy=True)
         self.sheets_exporter = None
+        self._process_pdfs = None  # extractors.pdf_worker.process_pdfs, set by _warmup_extractors()
+        self._warmup_done = threading.Event()
         
         # Setup UI
         self.setup_ui()
@@ -57,12 +70,35 @@ class TransportGUI:
         # Check credentials
         self.check_credentials()
         
+        # Start draining queued log lines into the log area
+        self.window.after(self.LOG_PUMP_MS, self._log_pump)
+        
+        # Import the extractors off the UI thread so the window shows up immediately
+        threading.Thread(target=self._warmup_extractors, daemon=True).start()
+        
+    def _warmup_extractors(self):
+        """Import the extraction modules and load the NER models in the background (runs in thread)"""
+        try:
+            from extractors.pdf_worker import process_pdfs, worker_init
+            worker_init()  # small batches run in this process
+            self._process_pdfs = process_pdfs
+            self.log("✅ Extractors loaded", "success")
+        except Exception as e:
+            self.log(f"❌ Failed to load extractors: {e}", "error")
+        finally:
+            self._warmup_done.set()
+        
     def setup_ui(self):
         """Build the user interface"""
         
         # Configure main window
         self.window.configure(bg=self.BG_COLOR)
         
+        # Shared fonts for the styles used by several widgets
+        self.F_BTN = tkfont.Font(family="Arial", size=14, weight="bold")
+        self.F_LABEL_BOLD = tkfont.Font(family="Arial", size=11, weight="bold")
+        self.F_SMALL = tkfont.Font(family="Arial", size=10)
+        
         # ==================== HEADER ====================
         header_frame = tk.Frame(self.window, bg=self.PRIMARY, height=80)
         header_frame.pack(fill=tk.X, padx=0, pady=0)
@@ -80,7 +116,7 @@ class TransportGUI:
         subtitle = tk.Label(
             header_frame,
             text="Extract data from PDFs and export to Google Sheets",
-            font=("Arial", 10),
+            font=self.F_SMALL,
             bg=self.PRIMARY,
             fg="white"
         )
@@ -90,7 +126,7 @@ class TransportGUI:
         input_frame = tk.LabelFrame(
             self.window,
             text="📁 PDF Folder Selection",
-            font=("Arial", 11, "bold"),
+            font=self.F_LABEL_BOLD,
             bg=self.BG_COLOR,
             padx=20,
             pady=15
@@ -115,7 +151,7 @@ class TransportGUI:
             path_frame,
             text="📂 Browse Folder",
             command=self.browse_folder,
-            font=("Arial", 14, "bold"),
+            font=self.F_BTN,
             bg=self.PRIMARY,
             fg="white",
             width=15,
@@ -148,7 +184,7 @@ class TransportGUI:
             action_frame,
             text="▶️  PROCESS & EXPORT",
             command=self.confirm_and_process,
-            font=("Arial", 14, "bold"),
+            font=self.F_BTN,
             bg=self.SUCCESS,
             fg="white",
             width=22,
@@ -164,7 +200,7 @@ class TransportGUI:
             action_frame,
             text="📄 PROCESS ONLY",
             command=self.confirm_and_process_only,
-            font=("Arial", 14, "bold"),
+            font=self.F_BTN,
             bg=self.WARNING,
             fg="white",
             width=18,
@@ -197,7 +233,7 @@ class TransportGUI:
             action_frame,
             text="🔗 Open Google Sheets",
             command=self.open_google_sheets,
-            font=("Arial", 14, "bold"),
+            font=self.F_BTN,
             bg="white",
             fg=self.PRIMARY,
             width=20,
@@ -213,7 +249,7 @@ class TransportGUI:
             action_frame,
             text="❓ Help",
             command=self.show_help,
-            font=("Arial", 14, "bold"),
+            font=self.F_BTN,
             bg="white",
             fg="#666",
             width=12,
@@ -228,7 +264,7 @@ class TransportGUI:
         progress_frame = tk.LabelFrame(
             self.window,
             text="📊 Progress",
-            font=("Arial", 11, "bold"),
+            font=self.F_LABEL_BOLD,
             bg=self.BG_COLOR,
             padx=15,
             pady=10
@@ -238,7 +274,8 @@ class TransportGUI:
         # Progress bar
         self.progress_bar = ttk.Progressbar(
             progress_frame,
-            mode='indeterminate',
+            mode='determinate',
+            maximum=100,
             length=800
         )
         self.progress_bar.pack(fill=tk.X, pady=(0, 10))
@@ -343,15 +380,30 @@ class TransportGUI:
             self.current_folder = folder
             self.folder_var.set(folder)
             self.save_last_folder(folder)
+            self._pdf_cache = None  # browsing (even to the same folder) forces a rescan
             self.scan_pdfs()
             
+    def _get_pdf_files(self):
+        """Sorted PDF names in the current folder, rescanned only when the folder changes"""
+        folder = self.current_folder
+        key = (folder, os.stat(folder).st_mtime_ns)  # adding/removing/renaming files bumps the mtime
+        
+        if self._pdf_cache is None or self._pdf_cache_key != key:
+            with os.scandir(folder) as entries:
+                self._pdf_cache = sorted(
+                    e.name for e in entries if is_pdf_name(e.name) and e.is_file()
+                )
+            self._pdf_cache_key = key
+        
+        return self._pdf_cache
+            
     def scan_pdfs(self):
         """Scan selected folder for PDF files"""
         if not self.current_folder:
             return
             
         try:
-            pdf_files = [f for f in os.listdir(self.current_folder) if f.lower().endswith('.pdf')]
+            pdf_files = self._get_pdf_files()
             count = len(pdf_files)
             
             if count == 0:
@@ -383,7 +435,7 @@ class TransportGUI:
             return
             
         try:
-            pdf_files = [f for f in os.listdir(self.current_folder) if f.lower().endswith('.pdf')]
+            pdf_files = self._get_pdf_files()
             count = len(pdf_files)
             
             if count == 0:
@@ -415,7 +467,7 @@ class TransportGUI:
             return
             
         try:
-            pdf_files = [f for f in os.listdir(self.current_folder) if f.lower().endswith('.pdf')]
+            pdf_files = self._get_pdf_files()
             count = len(pdf_files)
             
             if count == 0:
@@ -455,9 +507,11 @@ class TransportGUI:
         self.process_btn.config(state=tk.DISABLED)
         self.process_only_btn.config(state=tk.DISABLED)
         self.stop_btn.config(state=tk.NORMAL)
-        self.progress_bar.start(10)
+        self._progress = self._shown_progress = 0
+        self.progress_bar['value'] = 0
         
         # Clear log
+        self._log_queue.clear()
         self.log_text.config(state=tk.NORMAL)
         self.log_text.delete(1.0, tk.END)
         self.log_text.config(state=tk.DISABLED)
@@ -480,9 +534,7 @@ class TransportGUI:
             self.log("="*70, "bold")
             self.log("")
             
-            # Initialize components
-            pdf_reader = PDFReader(self.current_folder)
-            pdf_files = pdf_reader.list_pdf_files()
+            pdf_files = self._get_pdf_files()
             
             if not pdf_files:
                 self.log("❌ No PDF files found!", "error")
@@ -495,45 +547,44 @@ class TransportGUI:
             successful = 0
             failed = 0
             
-            # Process each PDF
-            for i, pdf_file in enumerate(pdf_files, 1):
+            # Extractors are imported in the background at startup
+            self._warmup_done.wait()
+            if self._process_pdfs is None:
+                self.log("❌ Extractors are not available!", "error")
+                self.finish_processing(None)
+                return
+            
+            # Process each PDF (larger batches run in parallel worker processes)
+            pdf_paths = [os.path.join(self.current_folder, pdf_file) for pdf_file in pdf_files]
+            results = self._process_pdfs(pdf_paths)
+            
+            for i, (pdf_path, data, error) in enumerate(results, 1):
                 if self.stop_requested:
+                    results.close()  # cancels PDFs not started yet
                     self.log("", "")
                     self.log("⏹️  Processing stopped by user", "warning")
                     break
                     
-                pdf_path = os.path.join(self.current_folder, pdf_file)
+                pdf_file = os.path.basename(pdf_path)
+                self._progress = 100 * i / len(pdf_files)
                 
                 self.log(f"[{i}/{len(pdf_files)}] {pdf_file:<45} ", "info")
                 
-                try:
-                    # Extract text
-                    text = pdf_reader.extract_text(pdf_path)
-                    
-                    # Extract data (order, date, plate, fracht)
-                    data = self.regex_extractor.extract_all_fields(text, verbose=False)
-                    
-                    # Extract cities using city_extractor (always!)
-                    loading_city, unloading_city = self.city_extractor.extract_from_text(text)
-                    data['miejsce_zaladunku'] = loading_city
-                    data['miejsce_rozladunku'] = unloading_city
-                    
-                    data['source_file'] = pdf_file
-                    
-                    # Check completeness
-                    missing = [k for k, v in data.items() if v is None and k != 'source_file']
-                    
-                    if missing:
-                        self.log(f"   ⚠️  Missing: {', '.join(missing)}", "warning")
-                    else:
-                        self.log(f"   ✅ Complete", "success")
-                        successful += 1
-                    
-                    all_results.append(data)
-                    
-                except Exception as e:
-                    self.log(f"   ❌ ERROR: {e}", "error")
+                if error is not None:
+                    self.log(f"   ❌ ERROR: {error}", "error")
                     failed += 1
+                    continue
+                
+                # Check completeness
+                missing = [k for k in REQUIRED_FIELDS if data.get(k) is None]
+                
+                if missing:
+                    self.log(f"   ⚠️  Missing: {', '.join(missing)}", "warning")
+                else:
+                    self.log(f"   ✅ Complete", "success")
+                    successful += 1
+                
+                all_results.append(data)
                     
             if self.stop_requested:
                 self.finish_processing(None)
@@ -558,9 +609,9 @@ class TransportGUI:
             self.log("")
             
             for plate, orders in sorted(grouped.items()):
-                self.log(f"🚗 {plate} ({len(orders)} orders):", "info")
+                # One log entry per plate instead of one per order
+                lines = [f"🚗 {plate} ({len(orders)} orders):"]
                 
-                total_fracht = 0
                 for order in orders:
                     zlecenie = order.get('zlecenie_nr', 'N/A')
                     date = order.get('termin_rozladunku', 'N/A')
@@ -568,21 +619,23 @@ class TransportGUI:
                     unloading = order.get('miejsce_rozladunku', '—')
                     fracht = order.get('fracht', 0) or 0
                     
-                    self.log(f"  • {zlecenie} | {date} | {loading} → {unloading} | {fracht} EUR", "info")
-                    total_fracht += fracht
+                    lines.append(f"  • {zlecenie} | {date} | {loading} → {unloading} | {fracht} EUR")
                 
+                total_fracht = self.data_processor.fracht_total(orders)
+                self.log("\n".join(lines), "info")
                 self.log(f"  💰 TOTAL: {total_fracht:.2f} EUR", "success")
                 self.log("")
             
             # Show orders without plate
             if no_plate:
-                self.log("⚠️  ORDERS WITHOUT LICENSE PLATE:", "warning")
+                lines = ["⚠️  ORDERS WITHOUT LICENSE PLATE:"]
                 for order in no_plate:
                     zlecenie = order.get('zlecenie_nr', 'N/A')
                     date = order.get('termin_rozladunku', 'N/A')
                     loading = order.get('miejsce_zaladunku', '—')
                     unloading = order.get('miejsce_rozladunku', '—')
-                    self.log(f"  • {zlecenie} | {date} | {loading} → {unloading}", "warning")
+                    lines.append(f"  • {zlecenie} | {date} | {loading} → {unloading}")
+                self.log("\n".join(lines), "warning")
                 self.log("")
             
             # Export to Google Sheets (ONLY if requested!)
@@ -596,39 +649,12 @@ class TransportGUI:
                     if not self.sheets_exporter:
                         self.sheets_exporter = GoogleSheetsExporter(GOOGLE_SHEET_ID, CREDENTIALS_FILE)
                     
-                    # Export orders (only once!)
-                    success_count = 0
-                    failed_count = 0
-                    
+                    # Export all plates in one grouped call (as the CLI does) instead of
+                    # one insert_order() round-trip per order; orders are already date-sorted
                     for plate, orders in grouped.items():
-                        # IMPORTANT: Sort orders by date BEFORE inserting!
-                        sorted_orders = sorted(
-                            orders, 
-                            key=lambda x: x.get('termin_rozladunku') or '9999-99-99'
-                        )
-                        
-                        self.log(f"📋 {plate} ({len(sorted_orders)} orders):", "info")
-                        for order in sorted_orders:
-                            order_nr = order.get('zlecenie_nr', 'unknown')
-                            date = order.get('termin_rozladunku', 'N/A')
-                            
-                            # Insert order (ONLY ONCE)
-                            success = self.sheets_exporter.insert_order(plate, order)
-                            
-                            if success:
-                                self.log(f"  → {order_nr} ({date})... ✅", "success")
-                                success_count += 1
-                            else:
-                                self.log(f"  → {order_nr} ({date})... ❌ FAILED", "error")
-                                # Error details are already printed by insert_order
-                                failed_count += 1
+                        self.log(f"📋 {plate} ({len(orders)} orders)", "info")
                     
-                    # Create stats
-                    stats = {
-                        'total': success_count + failed_count,
-                        'success': success_count,
-                        'failed': failed_count
-                    }
+                    stats = self.sheets_exporter.export_grouped_orders(grouped, verbose=False)
                     
                     # Handle no plate orders
                     if no_plate:
@@ -682,9 +708,6 @@ class TransportGUI:
         """Finish processing and update UI"""
         self.processing = False
         
-        # Stop progress bar
-        self.progress_bar.stop()
-        
         # Update buttons
         self.process_btn.config(state=tk.NORMAL)
         self.process_only_btn.config(state=tk.NORMAL)
@@ -732,15 +755,28 @@ class TransportGUI:
             )
             
     def log(self, message, tag=""):
-        """Add message to log text area"""
-        self.log_text.config(state=tk.NORMAL)
-        if tag:
-            self.log_text.insert(tk.END, message + "\n", tag)
-        else:
-            self.log_text.insert(tk.END, message + "\n")
-        self.log_text.see(tk.END)
-        self.log_text.config(state=tk.DISABLED)
-        self.window.update_idletasks()
+        """Queue message for the log text area (safe to call from the processing thread)"""
+        self._log_queue.append((message, tag))
+        
+    def _log_pump(self):
+        """Write queued log messages with a single insert and sync the progress bar,
+        then reschedule (runs in Tk main loop)"""
+        progress = self._progress
+        if progress != self._shown_progress:
+            self.progress_bar['value'] = self._shown_progress = progress
+        
+        if self._log_queue:
+            chunks = []
+            for _ in range(min(len(self._log_queue), self.LOG_PUMP_BATCH)):
+                message, tag = self._log_queue.popleft()
+                chunks.extend((message + "\n", tag))
+            
+            self.log_text.config(state=tk.NORMAL)
+            self.log_text.insert(tk.END, *chunks)
+            self.log_text.see(tk.END)
+            self.log_text.config(state=tk.DISABLED)
+        
+        self.window.after(self.LOG_PUMP_MS, self._log_pump)
         
     # def open_google_sheets(self):
     #     """Open Google Sheets in browser"""
@@ -786,7 +822,7 @@ Contact your IT team or check the documentation.
         
         text = scrolledtext.ScrolledText(
             help_window,
-            font=("Arial", 10),
+            font=self.F_SMALL,
             wrap=tk.WORD,
             padx=20,
             pady=20
@@ -799,7 +835,7 @@ Contact your IT team or check the documentation.
             help_window,
             text="Close",
             command=help_window.destroy,
-            font=("Arial", 10),
+            font=self.F_SMALL,
             padx=20,
             pady=5
         )
@@ -824,31 +860,52 @@ Contact your IT team or check the documentation.
             self.log("✅ Credentials found", "success")
             self.log("")
             
-    def load_last_folder(self):
-        """Load last used folder from config"""
+    def _load_config(self):
+        """Read the GUI config file once at startup"""
         config_file = Path("gui_config.json")
         if config_file.exists():
             try:
                 with open(config_file, 'r') as f:
                     config = json.load(f)
-                    return config.get('last_folder')
+                if isinstance(config, dict):
+                    return config
             except:
                 pass
-        return None
+        return {}
         
-    def save_last_folder(self, folder):
-        """Save last used folder to config"""
+    def _save_config(self):
+        """Write the GUI config file if anything changed this session"""
+        if not self._config_dirty:
+            return
         config_file = Path("gui_config.json")
-        config = {'last_folder': folder}
         try:
             with open(config_file, 'w') as f:
-                json.dump(config, f)
+                json.dump(self._config, f)
+            self._config_dirty = False
         except:
             pass
             
+    def load_last_folder(self):
+        """Load last used folder from config"""
+        return self._config.get('last_folder')
+        
+    def save_last_folder(self, folder):
+        """Remember last used folder (written to disk on close)"""
+        if self._config.get('last_folder') != folder:
+            self._config['last_folder'] = folder
+            self._config_dirty = True
+            
+    def _on_close(self):
+        """Flush the config and close the window"""
+        self._save_config()
+        self.window.destroy()
+        
     def run(self):
         """Start the GUI application"""
-        self.window.mainloop()
+        try:
+            self.window.mainloop()
+        finally:
+            self._save_config()  # no-op if _on_close() already saved
 
 
 def main():
@@ -1,29 +1,42 @@
 import os
-import json
-from extractors.pdf_reader import PDFReader
-from extractors.regex_extractor import RegexExtractor
+import sys
+import time
+from functools import cached_property
 from extractors.data_processor import DataProcessor
-from extractors.city_extractor import CityExtractor
-from utils.helpers import print_header
-from config import PDFS_FOLDER, JSON_OUTPUT, GOOGLE_SHEET_ID, CREDENTIALS_FILE, ENABLE_SHEETS_EXPORT
+# PDF/NER extractors (PyPDF2, spaCy) are imported on first use, see the properties below
+from utils.helpers import print_header, load_json_cached
+from config import PDFS_FOLDER, JSON_OUTPUT, REQUIRED_FIELDS, PROGRESS_FLUSH_S, GOOGLE_SHEET_ID, CREDENTIALS_FILE, ENABLE_SHEETS_EXPORT
 
 
 class TransportExtractorApp:
     """Main application class"""
     
     def __init__(self):
-        self.pdf_reader = PDFReader(PDFS_FOLDER)
-        self.regex_extractor = RegexExtractor()
         self.data_processor = DataProcessor()
-        self.city_extractor = CityExtractor(use_spacy=True)
         self.sheets_exporter = None  # Lazy initialization
-        self._sheets_exporter_initialized = False
+        self._sheets_exporter_key = None  # (credentials mtime, sheet id) it was built for
+    
+    @cached_property
+    def pdf_reader(self):
+        from extractors.pdf_reader import PDFReader
+        return PDFReader(PDFS_FOLDER)
+    
+    @cached_property
+    def regex_extractor(self):
+        from extractors.regex_extractor import RegexExtractor
+        return RegexExtractor()
+    
+    @cached_property
+    def city_extractor(self):
+        from extractors.city_extractor import CityExtractor
+        return CityExtractor(use_spacy=True)
     
     def process_single_pdf(self):
         """Interactive mode - process single PDF"""
         print_header("📄 SINGLE PDF EXTRACTION")
         
-        pdf_files = self.pdf_reader.list_pdf_files()
+        pdf_entries = self.pdf_reader.list_pdf_entries()
+        pdf_files = [name for name, _ in pdf_entries]
         
         if not pdf_files:
             print("❌ No PDF files found")
@@ -31,9 +44,7 @@ class TransportExtractorApp:
         
         print(f"📁 Found {len(pdf_files)} PDF files:\n")
         
-        for i, pdf_file in enumerate(pdf_files, 1):
-            pdf_path = os.path.join(PDFS_FOLDER, pdf_file)
-            size = self.pdf_reader.get_file_size(pdf_path)
+        for i, (pdf_file, size) in enumerate(pdf_entries, 1):
             print(f"  {i}. {pdf_file:<40} ({size:.1f} KB)")
         
         print()
@@ -100,28 +111,42 @@ class TransportExtractorApp:
             print(f"❌ Error: {e}")
     
     def _get_sheets_exporter(self):
-        """Get sheets exporter with lazy initialization"""
+        """Get sheets exporter with lazy initialization
+        
+        The authorized exporter is reused across exports and only rebuilt
+        when the credentials file is added or replaced.
+        """
         if not ENABLE_SHEETS_EXPORT:
             return None
         
-        if not self._sheets_exporter_initialized:
+        try:
+            credentials_mtime = os.stat(CREDENTIALS_FILE).st_mtime_ns
+        except OSError:
+            credentials_mtime = None
+        key = (credentials_mtime, GOOGLE_SHEET_ID)
+        
+        if key != self._sheets_exporter_key:
+            self._sheets_exporter_key = key
             try:
                 self.sheets_exporter = GoogleSheetsExporter(GOOGLE_SHEET_ID, CREDENTIALS_FILE)
-                self._sheets_exporter_initialized = True
             except FileNotFoundError as e:
                 print(f"❌ {e}")
-                print("   Google Sheets export will be unavailable for this session.")
+                print("   Google Sheets export will be unavailable until the credentials file is added.")
                 self.sheets_exporter = None
-                self._sheets_exporter_initialized = True
             except Exception as e:
                 print(f"❌ Failed to initialize Google Sheets exporter: {e}")
                 self.sheets_exporter = None
-                self._sheets_exporter_initialized = True
         
         return self.sheets_exporter
     
-    def export_to_sheets(self):
-        """Export last processing results to Google Sheets"""
+    def export_to_sheets(self, grouped_by_plate=None, no_plate=None):
+        """Export processing results to Google Sheets
+        
+        Args:
+            grouped_by_plate: Orders by plate from the batch just run; when
+                omitted, the last results are loaded from JSON_OUTPUT
+            no_plate: Orders without a plate from the same batch
+        """
         print_header("📊 EXPORT TO GOOGLE SHEETS")
         
         sheets_exporter = self._get_sheets_exporter()
@@ -131,17 +156,19 @@ class TransportExtractorApp:
             return
         
         # Load data from JSON file
-        if not os.path.exists(JSON_OUTPUT):
+        if grouped_by_plate is None and not os.path.exists(JSON_OUTPUT):
             print(f"❌ No extraction results found ({JSON_OUTPUT})")
             print("   Please process PDFs first (option 2 or 4)")
             return
         
         try:
-            with open(JSON_OUTPUT, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            
-            grouped_by_plate = data.get('grouped_by_plate', {})
-            no_plate = data.get('no_plate', [])
+            if grouped_by_plate is None:
+                data = load_json_cached(JSON_OUTPUT)
+                
+                grouped_by_plate = data.get('grouped_by_plate', {})
+                no_plate = data.get('no_plate', [])
+            elif no_plate is None:
+                no_plate = []
             
             if not grouped_by_plate and not no_plate:
                 print("❌ No data to export")
@@ -193,37 +220,39 @@ class TransportExtractorApp:
         
         print_header("⏳ PROCESSING...")
         
-        for i, pdf_file in enumerate(pdf_files, 1):
-            pdf_path = os.path.join(PDFS_FOLDER, pdf_file)
+        from extractors.pdf_worker import process_pdfs
+        
+        pdf_paths = [os.path.join(PDFS_FOLDER, pdf_file) for pdf_file in pdf_files]
+        
+        # Status lines are flushed at most every PROGRESS_FLUSH_S (and after the loop)
+        next_flush = time.monotonic() + PROGRESS_FLUSH_S
+        
+        for i, (pdf_path, data, error) in enumerate(process_pdfs(pdf_paths), 1):
+            pdf_file = os.path.basename(pdf_path)
             
-            print(f"[{i}/{len(pdf_files)}] {pdf_file:<45} ", end="")
+            line = f"[{i}/{len(pdf_files)}] {pdf_file:<45} "
             
-            try:
-                # Extract text
-                text = self.pdf_reader.extract_text(pdf_path)
-                
-                # Extract data
-                data = self.regex_extractor.extract_all_fields(text, verbose=False)
-                # Cities from full text
-                loading_city, unloading_city = self.city_extractor.extract_from_text(text)
-                data['miejsce_zaladunku'] = loading_city
-                data['miejsce_rozladunku'] = unloading_city
-                data['source_file'] = pdf_file
-                
+            if error is not None:
+                line += f"❌ ERROR: {error}\n"
+                failed += 1
+            else:
                 # Check completeness
-                missing = [k for k, v in data.items() if v is None and k != 'source_file']
+                missing = sum(1 for k in REQUIRED_FIELDS if data.get(k) is None)
                 
                 if missing:
-                    print(f"⚠️  ({len(missing)} missing)")
+                    line += f"⚠️  ({missing} missing)\n"
                 else:
-                    print("✅")
+                    line += "✅\n"
                     successful += 1
                 
                 all_results.append(data)
-                
-            except Exception as e:
-                print(f"❌ ERROR: {e}")
-                failed += 1
+            
+            sys.stdout.write(line)
+            if time.monotonic() >= next_flush:
+                sys.stdout.flush()
+                next_flush = time.monotonic() + PROGRESS_FLUSH_S
+        
+        sys.stdout.flush()
         
         # Group and display results
         grouped, no_plate = self.data_processor.group_by_plate(all_results)
@@ -248,7 +277,7 @@ class TransportExtractorApp:
         
         # Export to Google Sheets if requested
         if export_to_sheets:
-            self.export_to_sheets()
+            self.export_to_sheets(grouped, no_plate)
     
     def run(self):
         """Main application loop"""
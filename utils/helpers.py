@@ -1,11 +1,27 @@
 # utils/helpers.py
 """Helper utility functions"""
 
+import json
+import os
+from functools import lru_cache
+
+from config import PDF_EXTENSION
+
+try:
+    import orjson  # type: ignore
+except Exception:
+    orjson = None  # optional fast parser; stdlib json is used otherwise
+
+# path -> ((mtime_ns, size), parsed data), see load_json_cached()
+_json_cache = {}
+
+
 def format_currency(amount):
     """Format currency as EUR"""
     return f"{amount:.2f} EUR"
 
 
+@lru_cache(maxsize=4096)
 def format_date(date_str):
     """Convert DD.MM.YYYY to YYYY-MM-DD"""
     if not date_str:
@@ -18,6 +34,7 @@ def format_date(date_str):
         return None
 
 
+@lru_cache(maxsize=4096)
 def clean_plate_number(plate):
     """Clean and normalize license plate"""
     if not plate:
@@ -32,6 +49,38 @@ def clean_plate_number(plate):
     return plate
 
 
+def is_pdf_name(name):
+    """Check for the PDF extension, case-insensitively (lowercases only the suffix)"""
+    return name.endswith(PDF_EXTENSION) or name[-len(PDF_EXTENSION):].lower() == PDF_EXTENSION
+
+
+def load_json_cached(path):
+    """Load a JSON file, re-parsing only when its mtime or size changed
+
+    The returned object is shared between calls - don't modify it.
+    """
+    st = os.stat(path)
+    key = (st.st_mtime_ns, st.st_size)
+    
+    cached = _json_cache.get(path)
+    if cached is not None and cached[0] == key:
+        return cached[1]
+    
+    with open(path, 'rb') as f:
+        raw = f.read()
+    if orjson is None:
+        data = json.loads(raw)
+    else:
+        try:
+            data = orjson.loads(raw)
+        except orjson.JSONDecodeError:
+            # orjson is stricter than json (lone \udcxx escapes, NaN); let json decide
+            data = json.loads(raw)
+    
+    _json_cache[path] = (key, data)
+    return data
+
+
 def print_header(text, width=70):
     """Print formatted header"""
     print("\n" + "="*width)